@@ -1,25 +1,104 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import base64
+import asyncio
+import functools
 import hashlib
 import hmac
 import json
 import logging
+import re
+import threading
 import time
-from typing import Any, Dict, Optional, List, Tuple
-from urllib.parse import urlencode
+from binascii import b2a_base64
+from decimal import ROUND_DOWN, Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote_plus
 
+import httpx
+import orjson
 import requests
-from requests.exceptions import ConnectionError, Timeout
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
 from urllib3.exceptions import ProtocolError
+from urllib3.util.retry import Retry
+
+
+# chars quote_plus leaves untouched -> value can go into the query as-is
+_QS_SAFE_RE = re.compile(r"[A-Za-z0-9_.\-~]*")
+
+
+def _build_query(params: Dict[str, Any]) -> str:
+    parts = []
+    for k in sorted(params):
+        v = str(params[k])
+        if not _QS_SAFE_RE.fullmatch(v):
+            v = quote_plus(v)
+        parts.append(f"{k}={v}")
+    return "?" + "&".join(parts)
+
+
+@functools.lru_cache(maxsize=64)
+def _signed_target(base_url: str, m: str, path: str, qs: str) -> Tuple[str, bytes]:
+    """
+    (url, method+path+query prehash bytes) per distinct call shape;
+    per request only ts (front) and body (back) are added
+    """
+    return base_url + path + qs, (m + path + qs).encode("utf-8")
+
+
+# httpx errors raised before the request was written (no connection / no pool slot)
+_PRE_SEND_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+# Bitget envelope codes (already str on the wire; compared without str())
+_CODE_TS_EXPIRED = "40008"
+
+
+# (logical side, reduce_only) -> hedge-mode order side
+_HEDGE_SIDES = {
+    ("buy", False): "open_long",
+    ("sell", False): "open_short",
+    ("buy", True): "close_short",
+    ("sell", True): "close_long",
+}
+_ORDER_TYPES = frozenset(("market", "limit"))
+# placeOrder fields that batch-orders takes once at the top level
+_BATCH_SHARED = frozenset(("symbol", "marginCoin", "productType"))
+
+# holdSide spellings Bitget actually sends -> leg (anything else: lowercase prefix match)
+_HOLD_SIDES = {"long": "long", "short": "short", "LONG": "long", "SHORT": "short"}
+
+# position field aliases, first non-null numeric wins
+_LEG_FIELDS = (
+    ("size", ("total", "totalSize", "available", "availableSize")),
+    ("avg", ("averageOpenPrice", "avgOpenPrice")),
+    ("margin", ("margin", "marginAmount")),
+    ("pnl", ("unrealizedPL", "unrealizedPnl", "profit", "upl")),
+    ("lev", ("leverage",)),
+)
+
+
+def _fill_leg(dst: Dict[str, float], node: Dict[str, Any]) -> None:
+    for field, keys in _LEG_FIELDS:
+        val = 0.0
+        for k in keys:
+            v = node.get(k)
+            if v is not None:
+                try:
+                    val = float(v)
+                    break
+                except (TypeError, ValueError):
+                    pass
+        dst[field] = val
 
 
 class BitgetHTTPError(Exception):
-    def __init__(self, status: int, body: str):
+    def __init__(self, status: int, body: str, code: str = ""):
         super().__init__(f"bitget-http status={status} body={body}")
         self.status = status
         self.body = body
+        self.code = code
 
 
 class BitgetClient:
@@ -27,11 +106,14 @@ class BitgetClient:
     Bitget Mix (UMCBL) REST client
     - Sign: Base64(HMAC-SHA256(timestamp + method + path + body))
     - Robust retry for transient network issues
+    - Optional async transport (httpx, HTTP/2) via `aclient`
     - Helpers: ticker, positions(hedge detail), orders
     """
 
     BASE_URL = "https://api.bitget.com"
     SIGN_TYPE = "2"  # HMAC-SHA256 base64
+    TIME_EWMA_ALPHA = 0.1  # weight of each requestTime offset sample
+    TIME_RESYNC_BUDGET = 1  # 40008 -> clock resync + re-sign, per request
 
     def __init__(
         self,
@@ -43,26 +125,138 @@ class BitgetClient:
         margin_coin: str = "USDT",
         timeout: int = 10,
         logger: Optional[logging.Logger] = None,
+        aclient: Optional[httpx.AsyncClient] = None,
+        position_ttl: float = 0.25,
     ) -> None:
         if not api_key or not api_secret or not passphrase:
             raise ValueError("Bitget keys missing")
         self.api_key = api_key
         self.api_secret = api_secret
         self.passphrase = passphrase
+        # keyed HMAC state (ipad/opad already absorbed); copied per signature
+        self._hmac = hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
         self.product_type = product_type
         self.margin_coin = margin_coin
+        # constant part of every placeOrder body
+        self._order_template = {"marginCoin": margin_coin, "productType": product_type}
+        # symbol -> decimal places from contract specs (see load_contracts)
+        self._size_places: Dict[str, int] = {}
+        self._price_places: Dict[str, int] = {}
+        # symbol -> lot step (sizeMultiplier) / minimum order size (minTradeNum)
+        self._size_steps: Dict[str, Decimal] = {}
+        self._min_sizes: Dict[str, Decimal] = {}
         self.timeout = timeout
-        self.session = requests.Session()
+        self._static_headers = {
+            "ACCESS-KEY": api_key,
+            "ACCESS-PASSPHRASE": passphrase,
+            "ACCESS-SIGN-TYPE": self.SIGN_TYPE,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        # one requests.Session (own keep-alive pool) per calling thread
+        self._tl = threading.local()
+        # shared HTTP/2 client (owned by the caller, e.g. FastAPI startup)
+        self.aclient = aclient
+        # server_ms - local_ms, applied to every ACCESS-TIMESTAMP
+        self._time_offset_ms = 0
+        self._time_synced = False
+        # symbol -> (monotonic ts, hedge detail); dropped whenever we place an order
+        self.position_ttl = position_ttl
+        self._pos_cache: Dict[str, Tuple[float, Dict[str, Dict[str, float]]]] = {}
+        # bumped around every order; a read only caches if no order overlapped it
+        self._pos_gen: Dict[str, int] = {}
+        self._posq_cache: Dict[str, str] = {}
         self.log = logger or logging.getLogger("bitget")
 
     # --------- internal --------- #
+    @property
+    def session(self) -> requests.Session:
+        sess = getattr(self._tl, "session", None)
+        if sess is None:
+            sess = self._tl.session = self._new_session()
+        return sess
+
+    def _new_session(self) -> requests.Session:
+        # keep-alive pool; Retry only re-sends idempotent methods (never placeOrder)
+        sess = requests.Session()
+        sess.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                pool_block=False,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.1,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset(("GET",)),
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        sess.headers.update(self._static_headers)
+        return sess
+
+    @staticmethod
+    def _now_ms() -> int:
+        return time.time_ns() // 1_000_000
+
     def _ts(self) -> str:
-        return str(int(time.time() * 1000))
+        return str(self._now_ms() + self._time_offset_ms)
+
+    def _sign(self, ts: str, target: bytes, body: bytes) -> bytes:
+        # copy() of the keyed template skips ipad/opad derivation;
+        # pieces are fed straight into the state, no joined prehash copy.
+        h = self._hmac.copy()
+        h.update(ts.encode("ascii"))
+        h.update(target)
+        h.update(body)
+        # left as bytes: requests/httpx send bytes header values verbatim
+        return b2a_base64(h.digest(), newline=False)
+
+    def _prepare(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        body: Optional[Dict[str, Any]],
+        query: Optional[str] = None,
+    ) -> Tuple[str, str, bytes, bytes]:
+        m = method.upper()
+        if query is None:
+            query = _build_query(params) if m == "GET" and params else ""
+        url, target = _signed_target(self.BASE_URL, m, path, query)
+        # encoded once: the signed bytes are exactly the bytes on the wire
+        body_b = b"" if m == "GET" else orjson.dumps(body or {})
+        return m, url, target, body_b
 
-    def _sign(self, ts: str, method: str, path_with_qs: str, body: str) -> str:
-        msg = (ts + method.upper() + path_with_qs + body).encode("utf-8")
-        dig = hmac.new(self.api_secret.encode("utf-8"), msg, hashlib.sha256).digest()
-        return base64.b64encode(dig).decode("utf-8")
+    def _headers(self, target: bytes, body_b: bytes) -> Dict[str, Any]:
+        # per-request part only; static auth headers live on the session / _static_headers
+        ts = self._ts()
+        return {"ACCESS-TIMESTAMP": ts, "ACCESS-SIGN": self._sign(ts, target, body_b)}
+
+    def _decode(self, m: str, path: str, status: int, raw: bytes) -> Dict[str, Any]:
+        # parse straight from bytes; only decode to str for error reporting
+        if 200 <= status < 300:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass
+            try:
+                # stdlib is laxer (NaN/Infinity); only reached on odd bodies
+                return json.loads(raw)
+            except ValueError:
+                raise BitgetHTTPError(status, raw[:512].decode("utf-8", "replace")) from None
+        body = raw[:512].decode("utf-8", "replace")
+        self.log.error("Bitget HTTP %s %s -> %s | %s", m, path, status, body)
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            data = None
+        code = data.get("code") if isinstance(data, dict) else None
+        if not isinstance(code, str):
+            code = "" if code is None else str(code)
+        raise BitgetHTTPError(status, body, code)
 
     def _request(
         self,
@@ -71,51 +265,41 @@ class BitgetClient:
         params: Optional[Dict[str, Any]] = None,
         body: Optional[Dict[str, Any]] = None,
         *,
+        query: Optional[str] = None,
         max_retry: int = 4,
     ) -> Dict[str, Any]:
-        m = method.upper()
-        params = params or {}
-        body = body or {}
-        qs = ""
-        if m == "GET" and params:
-            parts = [(k, params[k]) for k in sorted(params.keys())]
-            qs = "?" + urlencode(parts)
-
-        url = self.BASE_URL + path + qs
-        body_str = "" if m == "GET" else json.dumps(body, separators=(",", ":"), ensure_ascii=False)
+        m, url, target, body_b = self._prepare(method, path, params, body, query)
 
         backoff = 0.25
+        resync_left = self.TIME_RESYNC_BUDGET
         last_exc: Optional[Exception] = None
         for _try in range(1, max_retry + 1):
-            ts = self._ts()
-            sign = self._sign(ts, m, path + qs, body_str)
-            headers = {
-                "ACCESS-KEY": self.api_key,
-                "ACCESS-PASSPHRASE": self.passphrase,
-                "ACCESS-SIGN-TYPE": self.SIGN_TYPE,
-                "ACCESS-TIMESTAMP": ts,
-                "ACCESS-SIGN": sign,
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Connection": "close",
-            }
+            headers = self._headers(target, body_b)
             try:
+                t0 = self._now_ms()
                 resp = self.session.request(
                     m,
                     url,
                     headers=headers,
-                    data=body_str if m != "GET" else None,
+                    data=body_b if m != "GET" else None,
                     timeout=self.timeout,
                 )
-                if 200 <= resp.status_code < 300:
-                    return resp.json()
-                try:
-                    payload = resp.json()
-                except Exception:
-                    payload = {"raw": resp.text}
-                self.log.error("Bitget HTTP %s %s -> %s | %s", m, path, resp.status_code, payload)
-                resp.raise_for_status()
+                res = self._decode(m, path, resp.status_code, resp.content)
+                self._observe_server_time(res, t0, self._now_ms())
+                return res
+            except BitgetHTTPError as e:
+                # 40008: timestamp outside the window -> hard clock reset once and re-sign
+                if e.code != _CODE_TS_EXPIRED or resync_left <= 0:
+                    raise
+                resync_left -= 1
+                self.log.warning("40008 on %s %s, resyncing clock", m, path)
+                self.sync_time(reset=True)
+                continue
             except (ConnectionError, Timeout, ProtocolError) as e:
+                # a POST may already have reached Bitget (read timeout, dropped reply):
+                # never resend it; connect failures are retried inside urllib3 already
+                if m != "GET" and not isinstance(e, ConnectTimeout):
+                    raise
                 last_exc = e
                 self.log.warning("retry %s %s %s: %s", _try, m, path, e)
                 time.sleep(backoff)
@@ -126,9 +310,170 @@ class BitgetClient:
             raise last_exc
         raise RuntimeError("Bitget request failed")
 
+    async def _arequest(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        *,
+        query: Optional[str] = None,
+        max_retry: int = 4,
+    ) -> Dict[str, Any]:
+        """
+        async twin of `_request` over the shared `aclient` (HTTP/2 multiplexed).
+        Body is sent as the exact bytes that were signed.
+        """
+        if self.aclient is None:
+            raise RuntimeError("Bitget async client not attached")
+        m, url, target, body_b = self._prepare(method, path, params, body, query)
+        content = body_b if m != "GET" else None
+
+        backoff = 0.25
+        resync_left = self.TIME_RESYNC_BUDGET
+        last_exc: Optional[Exception] = None
+        for _try in range(1, max_retry + 1):
+            headers = {**self._static_headers, **self._headers(target, body_b)}
+            try:
+                t0 = self._now_ms()
+                resp = await self.aclient.request(
+                    m,
+                    url,
+                    headers=headers,
+                    content=content,
+                    timeout=self.timeout,
+                )
+                res = self._decode(m, path, resp.status_code, resp.content)
+                self._observe_server_time(res, t0, self._now_ms())
+                return res
+            except BitgetHTTPError as e:
+                if e.code != _CODE_TS_EXPIRED or resync_left <= 0:
+                    raise
+                resync_left -= 1
+                self.log.warning("40008 on %s %s, resyncing clock", m, path)
+                await self.async_time(reset=True)
+                continue
+            except httpx.TransportError as e:
+                # same rule as `_request`: POST is resent only if it provably never left
+                if m != "GET" and not isinstance(e, _PRE_SEND_ERRORS):
+                    raise
+                last_exc = e
+                self.log.warning("retry %s %s %s: %s", _try, m, path, e)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 1.5, 1.2)
+                continue
+
+        if last_exc:
+            raise last_exc
+        raise RuntimeError("Bitget request failed")
+
+    # --------- clock --------- #
+    _SERVER_TIME_PATH = "/api/mix/v1/market/time"
+
+    def _apply_server_time(self, res: Dict[str, Any], t0: int, t1: int, *, reset: bool = False) -> int:
+        # Cristian: server clock vs. midpoint of the local send/receive window
+        server_ms = res.get("data") or res.get("requestTime")
+        self._blend_offset(int(server_ms) - (t0 + t1) // 2, reset)
+        return self._time_offset_ms
+
+    def _observe_server_time(self, res: Any, t0: int, t1: int) -> None:
+        # every envelope carries requestTime -> free offset sample
+        server_ms = res.get("requestTime") if isinstance(res, dict) else None
+        if server_ms is None:
+            return
+        self._blend_offset(int(server_ms) - (t0 + t1) // 2, False)
+
+    def _blend_offset(self, sample: int, reset: bool) -> None:
+        # EWMA over all samples; only the first one (or a 40008 resync) is taken as-is
+        if self._time_synced and not reset:
+            a = self.TIME_EWMA_ALPHA
+            self._time_offset_ms = int((1 - a) * self._time_offset_ms + a * sample)
+        else:
+            self._time_offset_ms = sample
+            self._time_synced = True
+
+    def sync_time(self, *, reset: bool = False) -> int:
+        t0 = self._now_ms()
+        resp = self.session.get(self.BASE_URL + self._SERVER_TIME_PATH, timeout=self.timeout)
+        resp.raise_for_status()
+        return self._apply_server_time(orjson.loads(resp.content), t0, self._now_ms(), reset=reset)
+
+    async def async_time(self, *, reset: bool = False) -> int:
+        if self.aclient is None:
+            raise RuntimeError("Bitget async client not attached")
+        t0 = self._now_ms()
+        resp = await self.aclient.get(self.BASE_URL + self._SERVER_TIME_PATH, timeout=self.timeout)
+        resp.raise_for_status()
+        return self._apply_server_time(orjson.loads(resp.content), t0, self._now_ms(), reset=reset)
+
     # --------- market --------- #
+    _CONTRACTS_PATH = "/api/mix/v1/market/contracts"
+
+    def load_contracts(self) -> int:
+        return self._store_contracts(
+            self._request("GET", self._CONTRACTS_PATH, query=f"?productType={quote_plus(self.product_type)}")
+        )
+
+    async def aload_contracts(self) -> int:
+        return self._store_contracts(
+            await self._arequest("GET", self._CONTRACTS_PATH, query=f"?productType={quote_plus(self.product_type)}")
+        )
+
+    def _store_contracts(self, res: Dict[str, Any]) -> int:
+        n = 0
+        for c in res.get("data") or []:
+            sym = c.get("symbol") if isinstance(c, dict) else None
+            if not sym:
+                continue
+            try:
+                self._size_places[sym] = int(c["volumePlace"])
+                self._price_places[sym] = int(c["pricePlace"])
+                n += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            for key, dst in (("sizeMultiplier", self._size_steps), ("minTradeNum", self._min_sizes)):
+                try:
+                    v = Decimal(str(c[key]))
+                except (KeyError, InvalidOperation):
+                    continue
+                if v.is_finite() and v > 0:
+                    dst[sym] = v
+        return n
+
+    @staticmethod
+    def _fmt_places(v: Any, places: int) -> str:
+        if isinstance(v, str):
+            return v
+        txt = f"{v:.{places}f}"
+        return txt.rstrip("0").rstrip(".") if "." in txt else txt
+
+    def fmt_size(self, symbol: str, size: Any) -> str:
+        """
+        size truncated (never rounded up) to a multiple of the contract lot step
+        (sizeMultiplier; volumePlace decimals, 6 until contracts are loaded).
+        raises ValueError when nothing is left or it is below minTradeNum.
+        """
+        step = self._size_steps.get(symbol) or Decimal(1).scaleb(-self._size_places.get(symbol, 6))
+        try:
+            d = Decimal(str(size))
+        except InvalidOperation:
+            raise ValueError(f"bad size: {size!r}") from None
+        if not d.is_finite():
+            raise ValueError(f"bad size: {size!r}")
+        d = (d / step).to_integral_value(rounding=ROUND_DOWN) * step
+        if d <= 0:
+            raise ValueError(f"size {size!r} below lot step {step} for {symbol}")
+        min_size = self._min_sizes.get(symbol)
+        if min_size is not None and d < min_size:
+            raise ValueError(f"size {size!r} below minTradeNum {min_size} for {symbol}")
+        txt = f"{d:f}"
+        return txt.rstrip("0").rstrip(".") if "." in txt else txt
+
+    def fmt_price(self, symbol: str, price: Any) -> str:
+        return self._fmt_places(price, self._price_places.get(symbol, 6))
+
     def get_last_price(self, symbol: str) -> float:
-        res = self._request("GET", "/api/mix/v1/market/ticker", params={"symbol": symbol})
+        res = self._request("GET", "/api/mix/v1/market/ticker", query=f"?symbol={quote_plus(symbol)}")
         data = res.get("data", {}) or {}
         for k in ("last", "lastPrice", "close", "closePrice", "markPrice"):
             v = data.get(k)
@@ -140,57 +485,79 @@ class BitgetClient:
         raise RuntimeError(f"ticker parse failed: {data}")
 
     # --------- positions (hedge) --------- #
-    def get_hedge_detail(self, symbol: str) -> Dict[str, Dict[str, float]]:
+    _HEDGE_DETAIL_PATH = "/api/mix/v1/position/singlePosition"
+
+    def get_hedge_detail(self, symbol: str, *, fresh: bool = False) -> Dict[str, Dict[str, float]]:
         """
         return:
         {
           "long": {"size": float, "avg": float, "margin": float, "pnl": float, "lev": float},
           "short":{"size": float, "avg": float, "margin": float, "pnl": float, "lev": float}
         }
+        fresh=True skips the TTL cache (order sizing / post-order checks).
         """
-        path = "/api/mix/v1/position/singlePosition"
-        params = {"symbol": symbol, "marginCoin": self.margin_coin}
-        res = self._request("GET", path, params=params)
+        hit = None if fresh else self._cached_position(symbol)
+        if hit is not None:
+            return hit
+        gen = self._pos_gen.get(symbol, 0)
+        res = self._request("GET", self._HEDGE_DETAIL_PATH, query=self._hedge_detail_query(symbol))
+        return self._store_position(symbol, gen, self._parse_hedge_detail(res))
+
+    async def aget_hedge_detail(self, symbol: str, *, fresh: bool = False) -> Dict[str, Dict[str, float]]:
+        hit = None if fresh else self._cached_position(symbol)
+        if hit is not None:
+            return hit
+        gen = self._pos_gen.get(symbol, 0)
+        res = await self._arequest("GET", self._HEDGE_DETAIL_PATH, query=self._hedge_detail_query(symbol))
+        return self._store_position(symbol, gen, self._parse_hedge_detail(res))
+
+    def _cached_position(self, symbol: str) -> Optional[Dict[str, Dict[str, float]]]:
+        ent = self._pos_cache.get(symbol)
+        if ent is not None and time.monotonic() - ent[0] < self.position_ttl:
+            return ent[1]
+        return None
+
+    def _store_position(
+        self, symbol: str, gen: int, detail: Dict[str, Dict[str, float]]
+    ) -> Dict[str, Dict[str, float]]:
+        # an order overlapped this read -> snapshot may predate the fill; return it, don't cache it
+        if self._pos_gen.get(symbol, 0) == gen:
+            self._pos_cache[symbol] = (time.monotonic(), detail)
+        return detail
+
+    def _invalidate_position(self, symbol: str) -> None:
+        self._pos_gen[symbol] = self._pos_gen.get(symbol, 0) + 1
+        self._pos_cache.pop(symbol, None)
+
+    def _hedge_detail_query(self, symbol: str) -> str:
+        # fixed shape, keys already in sorted order; built once per symbol
+        q = self._posq_cache.get(symbol)
+        if q is None:
+            q = self._posq_cache[symbol] = f"?marginCoin={quote_plus(self.margin_coin)}&symbol={quote_plus(symbol)}"
+        return q
+
+    @staticmethod
+    def _parse_hedge_detail(res: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
         data = res.get("data", {})
         out = {
             "long": {"size": 0.0, "avg": 0.0, "margin": 0.0, "pnl": 0.0, "lev": 0.0},
             "short": {"size": 0.0, "avg": 0.0, "margin": 0.0, "pnl": 0.0, "lev": 0.0},
         }
 
-        def fill(dst: Dict[str, float], node: Dict[str, Any]):
-            def fget(keys: List[str], cast=float, default=0.0):
-                for k in keys:
-                    if k in node and node[k] is not None:
-                        try:
-                            return cast(node[k])
-                        except Exception:
-                            pass
-                return default
-
-            dst["size"] = fget(["total", "totalSize", "available", "availableSize"])
-            dst["avg"] = fget(["averageOpenPrice", "avgOpenPrice"])
-            dst["margin"] = fget(["margin", "marginAmount"])
-            dst["pnl"] = fget(["unrealizedPL", "unrealizedPnl", "profit", "upl"])
-            dst["lev"] = fget(["leverage"], cast=float) or fget(["leverage"], cast=int)
-
         if isinstance(data, dict):
-            l = data.get("long") or {}
-            s = data.get("short") or {}
-            fill(out["long"], l)
-            fill(out["short"], s)
+            _fill_leg(out["long"], data.get("long") or {})
+            _fill_leg(out["short"], data.get("short") or {})
         elif isinstance(data, list):  # some regions return list
             for p in data:
                 if not isinstance(p, dict):
                     continue
-                side = (p.get("holdSide") or p.get("side") or "").lower()
-                node = {}
-                # normalize keys
-                for k in p.keys():
-                    node[k] = p[k]
-                if side.startswith("long"):
-                    fill(out["long"], node)
-                elif side.startswith("short"):
-                    fill(out["short"], node)
+                raw_side = p.get("holdSide") or p.get("side") or ""
+                leg = _HOLD_SIDES.get(raw_side)
+                if leg is None:
+                    s = str(raw_side).lower()
+                    leg = "long" if s.startswith("long") else "short" if s.startswith("short") else None
+                if leg is not None:
+                    _fill_leg(out[leg], p)
 
         return out
 
@@ -201,12 +568,14 @@ class BitgetClient:
     # --------- order helpers (hedge-aware sides) --------- #
     @staticmethod
     def _map_side_for_hedge(logical_side: str, reduce_only: bool) -> str:
-        s = logical_side.lower()
-        if not reduce_only:
-            return "open_long" if s == "buy" else "open_short"
-        return "close_short" if s == "buy" else "close_long"
+        try:
+            return _HEDGE_SIDES[(logical_side.lower(), bool(reduce_only))]
+        except KeyError:
+            raise ValueError(f"bad side: {logical_side!r}") from None
+
+    _PLACE_ORDER_PATH = "/api/mix/v1/order/placeOrder"
 
-    def _place(
+    def _place_body(
         self,
         *,
         tv_symbol: str,
@@ -218,31 +587,81 @@ class BitgetClient:
         price: Optional[str] = None,
         tif: Optional[str] = None,
     ) -> Dict[str, Any]:
+        otype = order_type.lower()
+        if otype not in _ORDER_TYPES:
+            raise ValueError(f"bad order type: {order_type!r}")
         body = {
             "symbol": tv_symbol,
-            "marginCoin": self.margin_coin,
-            "productType": self.product_type,
+            **self._order_template,
             "side": self._map_side_for_hedge(side, reduce_only),
-            "orderType": order_type.lower(),
-            "size": str(size),
+            "orderType": otype,
+            "size": self.fmt_size(tv_symbol, size),
             "reduceOnly": bool(reduce_only),
         }
         if client_oid:
             body["clientOid"] = client_oid
-        if price and body["orderType"] == "limit":
-            body["price"] = str(price)
+        if price and otype == "limit":
+            body["price"] = self.fmt_price(tv_symbol, price)
         if tif:
             body["timeInForceValue"] = tif
-        return self._request("POST", "/api/mix/v1/order/placeOrder", body=body)
+        return body
+
+    def _place(self, **kw: Any) -> Dict[str, Any]:
+        body = self._place_body(**kw)
+        # before: reads already in flight must not cache a pre-fill snapshot;
+        # after: even a failed/timed-out order may have filled
+        self._invalidate_position(body["symbol"])
+        try:
+            return self._request("POST", self._PLACE_ORDER_PATH, body=body)
+        finally:
+            self._invalidate_position(body["symbol"])
+
+    async def _aplace(self, **kw: Any) -> Dict[str, Any]:
+        body = self._place_body(**kw)
+        self._invalidate_position(body["symbol"])
+        try:
+            return await self._arequest("POST", self._PLACE_ORDER_PATH, body=body)
+        finally:
+            self._invalidate_position(body["symbol"])
+
+    _BATCH_ORDERS_PATH = "/api/mix/v1/order/batch-orders"
+
+    def _batch_body(self, symbol: str, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        items = []
+        for o in orders:
+            b = self._place_body(tv_symbol=symbol, **o)
+            items.append({k: v for k, v in b.items() if k not in _BATCH_SHARED})
+        return {"symbol": symbol, "marginCoin": self.margin_coin, "orderDataList": items}
+
+    def place_orders_batch(self, symbol: str, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        up to 50 orders on one symbol in a single signed POST (one RTT).
+        each item holds `_place_body` kwargs minus tv_symbol; per-order rejections
+        come back in data.failure (matched by clientOid), not as an exception.
+        """
+        body = self._batch_body(symbol, orders)
+        self._invalidate_position(symbol)
+        try:
+            return self._request("POST", self._BATCH_ORDERS_PATH, body=body)
+        finally:
+            self._invalidate_position(symbol)
+
+    async def aplace_orders_batch(self, symbol: str, orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+        body = self._batch_body(symbol, orders)
+        self._invalidate_position(symbol)
+        try:
+            return await self._arequest("POST", self._BATCH_ORDERS_PATH, body=body)
+        finally:
+            self._invalidate_position(symbol)
 
     def place_market_order(self, *, symbol: str, side: str, size: float, reduce_only: bool = False) -> Dict[str, Any]:
         return self._place(
             tv_symbol=symbol,
             side=side,
             order_type="market",
-            size=str(size),
+            size=size,
             reduce_only=reduce_only,
-            client_oid=f"siu-{int(time.time()*1000)}",
+            client_oid=f"siu-{self._now_ms()}",
         )
 
     # convenience
@@ -257,3 +676,16 @@ class BitgetClient:
 
     def close_short(self, symbol: str, size: str, order_type: str = "market") -> Dict[str, Any]:
         return self._place(tv_symbol=symbol, side="buy", order_type=order_type, size=size, reduce_only=True)
+
+    # convenience (async)
+    async def aopen_long(self, symbol: str, size: str, order_type: str = "market") -> Dict[str, Any]:
+        return await self._aplace(tv_symbol=symbol, side="buy", order_type=order_type, size=size, reduce_only=False)
+
+    async def aopen_short(self, symbol: str, size: str, order_type: str = "market") -> Dict[str, Any]:
+        return await self._aplace(tv_symbol=symbol, side="sell", order_type=order_type, size=size, reduce_only=False)
+
+    async def aclose_long(self, symbol: str, size: str, order_type: str = "market") -> Dict[str, Any]:
+        return await self._aplace(tv_symbol=symbol, side="sell", order_type=order_type, size=size, reduce_only=True)
+
+    async def aclose_short(self, symbol: str, size: str, order_type: str = "market") -> Dict[str, Any]:
+        return await self._aplace(tv_symbol=symbol, side="buy", order_type=order_type, size=size, reduce_only=True)
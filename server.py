@@ -2,13 +2,15 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import hmac
 import logging
 import os
 import time
-from typing import Any, Dict, Set
+from typing import Any, Dict, Optional, Set, Tuple
 
-import requests
+import httpx
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
@@ -20,6 +22,7 @@ BITGET_API_SECRET = os.getenv("BITGET_API_SECRET", "")
 BITGET_PASSPHRASE = os.getenv("BITGET_PASSPHRASE", "")
 TRADE_MODE = os.getenv("TRADE_MODE", "live")
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+_WEBHOOK_SECRET_B = WEBHOOK_SECRET.encode("utf-8")
 
 # TP: ROE(= unrealizedPnL / margin)
 TP_ROE_PERCENT = float(os.getenv("TP_ROE_PERCENT", os.getenv("TP_PERCENT", "0.07")))
@@ -32,8 +35,15 @@ REENTRY_SIZE_MULT = float(os.getenv("REENTRY_SIZE_MULT", "1.0"))
 REENTRY_COOLDOWN_SEC = float(os.getenv("REENTRY_COOLDOWN_SEC", "30"))
 REENTRY_MAX_TRIES = int(os.getenv("REENTRY_MAX_TRIES", "1"))
 
+# Bitget clock offset refresh
+TIME_SYNC_SEC = float(os.getenv("TIME_SYNC_SEC", "60"))
+
+# Bitget HTTP/2 pool
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "64"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "32"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "85"))
+
 logger = logging.getLogger("uvicorn.error")
-logger.setLevel(logging.INFO)
 
 app = FastAPI(title="siu-autotrade-gui")
 
@@ -47,6 +57,7 @@ bg = BitgetClient(
 )
 
 # ========= utils / state =========
+@functools.lru_cache(maxsize=256)
 def normalize_symbol(sym: str) -> str:
     if not sym:
         return "BTCUSDT_UMCBL"
@@ -69,10 +80,6 @@ def symbol_lock(symbol: str) -> asyncio.Lock:
         _symbol_locks[symbol] = asyncio.Lock()
     return _symbol_locks[symbol]
 
-def _fmt_qty(q: float) -> str:
-    txt = f"{q:.6f}"
-    return txt.rstrip("0").rstrip(".") if "." in txt else txt
-
 async def sleep(s: float):  # small helper
     await asyncio.sleep(s)
 
@@ -86,7 +93,7 @@ async def ensure_close_full(symbol: str, side_to_close: str, *, max_retry: int =
     backoff = 0.25
     for _ in range(max_retry):
         try:
-            d = bg.get_hedge_detail(symbol)
+            d = await bg.aget_hedge_detail(symbol, fresh=True)
         except Exception as e:
             logger.info("get_hedge_detail fail: %r", e)
             await sleep(backoff); backoff = min(backoff * 1.5, 1.2)
@@ -97,16 +104,16 @@ async def ensure_close_full(symbol: str, side_to_close: str, *, max_retry: int =
 
         if side_to_close == "LONG":
             if long_sz <= 0: return {"ok": True, "closed": {"skipped": True}}
-            try: bg.close_long(symbol, _fmt_qty(long_sz))
+            try: await bg.aclose_long(symbol, bg.fmt_size(symbol, long_sz))
             except Exception as e: logger.info("close_long err: %r", e)
         else:
             if short_sz <= 0: return {"ok": True, "closed": {"skipped": True}}
-            try: bg.close_short(symbol, _fmt_qty(short_sz))
+            try: await bg.aclose_short(symbol, bg.fmt_size(symbol, short_sz))
             except Exception as e: logger.info("close_short err: %r", e)
 
         await sleep(backoff); backoff = min(backoff * 1.5, 1.2)
         try:
-            d2 = bg.get_hedge_detail(symbol)
+            d2 = await bg.aget_hedge_detail(symbol, fresh=True)
             if side_to_close == "LONG" and float(d2["long"]["size"] or 0) <= 0:
                 return {"ok": True, "closed": {"size_before": long_sz, "size_after": 0.0}}
             if side_to_close == "SHORT" and float(d2["short"]["size"] or 0) <= 0:
@@ -116,6 +123,106 @@ async def ensure_close_full(symbol: str, side_to_close: str, *, max_retry: int =
 
     return {"ok": False, "error": "close_not_flat"}
 
+# ========= reverse (batch) =========
+_CODE_DUP_CLIENT_OID = "40786"  # Duplicate clientOid
+
+def batch_rejected(res: Dict[str, Any]) -> Set[str]:
+    """
+    batch-orders data.failure 중 실제로 거절된 clientOid 집합
+    - 중복 clientOid 실패는 같은 주문이 이미 접수된 것이므로 거절로 보지 않음
+    """
+    out: Set[str] = set()
+    for f in (res.get("data") or {}).get("failure") or []:
+        if not isinstance(f, dict):
+            continue
+        code = str(f.get("errorCode") or f.get("code") or "")
+        if code == _CODE_DUP_CLIENT_OID or "duplicate" in str(f.get("errorMsg") or "").lower():
+            logger.info("[reverse] duplicate clientOid %s -> already placed", f.get("clientOid"))
+            continue
+        out.add(f.get("clientOid"))
+    return out
+
+async def reverse_batch(symbol: str, side_to_close: str, qty: str, otype: str) -> Tuple[Dict[str, Any], Any]:
+    """
+    반대 사이드 전량 청산 + 신규 진입을 batch-orders 한 번(서명 1회, RTT 1회)으로 전송
+      side_to_close = "LONG" | "SHORT"
+    - 청산 수량은 캐시 없이 조회, 배치 후 재조회로 0(flat) 확인된 경우에만 청산 성공
+    - 조회/배치 요청 자체가 실패하면 ensure_close_full + 단건 진입으로 대체
+    - 청산 주문이 거절되거나 잔량이 남으면 ensure_close_full 로 마무리
+    - 신규 진입이 거절되면 (청산 성공 시) 단건 주문으로 재시도
+    """
+    side = "buy" if side_to_close == "SHORT" else "sell"
+    open_one = bg.aopen_long if side == "buy" else bg.aopen_short
+    close_leg = "short" if side_to_close == "SHORT" else "long"
+    open_leg = "long" if close_leg == "short" else "short"
+
+    try:
+        d = await bg.aget_hedge_detail(symbol, fresh=True)
+    except Exception as e:
+        logger.info("[reverse] position read err %s: %r -> fallback", symbol, e)
+        return await reverse_fallback(symbol, side_to_close, qty, otype)
+    close_sz = float(d[close_leg]["size"] or 0)
+    if close_sz <= 0:
+        return {"ok": True, "closed": {"skipped": True}}, await open_one(symbol, qty, otype)
+
+    oid = f"siu-{bg._now_ms()}"
+    try:
+        res = await bg.aplace_orders_batch(symbol, [
+            {"side": side, "order_type": "market", "size": bg.fmt_size(symbol, close_sz),
+             "reduce_only": True, "client_oid": oid + "-c"},
+            {"side": side, "order_type": otype, "size": qty,
+             "reduce_only": False, "client_oid": oid + "-o"},
+        ])
+    except Exception as e:
+        logger.info("[reverse] batch err %s: %r -> fallback", symbol, e)
+        # a timed-out batch may still have landed: only open if the new leg did not grow
+        return await reverse_fallback(symbol, side_to_close, qty, otype,
+                                      open_before=float(d[open_leg]["size"] or 0))
+    failed = batch_rejected(res)
+
+    closed = None
+    if oid + "-c" in failed:
+        logger.info("[reverse] batch close rejected %s %s -> fallback", symbol, side_to_close)
+    else:
+        try:
+            d2 = await bg.aget_hedge_detail(symbol, fresh=True)
+            if float(d2[close_leg]["size"] or 0) <= 0:
+                closed = {"ok": True, "closed": {"size_before": close_sz, "size_after": 0.0, "batch": True}}
+            else:
+                logger.info("[reverse] not flat after batch %s %s -> fallback", symbol, side_to_close)
+        except Exception as e:
+            logger.info("[reverse] post-batch read err %s: %r -> fallback", symbol, e)
+    if closed is None:
+        closed = await ensure_close_full(symbol, side_to_close)
+
+    opened = res
+    if oid + "-o" in failed and closed.get("ok"):
+        logger.info("[reverse] batch open rejected %s -> single order", symbol)
+        opened = await open_one(symbol, qty, otype)
+    return closed, opened
+
+async def reverse_fallback(
+    symbol: str, side_to_close: str, qty: str, otype: str, *, open_before: Optional[float] = None
+) -> Tuple[Dict[str, Any], Any]:
+    """
+    비배치 경로: ensure_close_full 로 청산 확인 후 단건 진입 1회 (청산 실패 시 진입 안 함)
+    open_before: 실패한 배치 전의 신규 방향 사이즈 -> 늘어났으면 배치 진입이 이미 체결된 것
+    """
+    closed = await ensure_close_full(symbol, side_to_close)
+    if not closed.get("ok"):
+        return closed, None
+    if open_before is not None:
+        open_leg = "long" if side_to_close == "SHORT" else "short"
+        try:
+            d = await bg.aget_hedge_detail(symbol, fresh=True)
+        except Exception as e:
+            logger.info("[reverse] open check err %s: %r -> open skipped", symbol, e)
+            return closed, {"ok": False, "error": "open_unverified"}
+        if float(d[open_leg]["size"] or 0) > open_before:
+            return closed, {"ok": True, "batch_open_landed": True}
+    open_one = bg.aopen_long if side_to_close == "SHORT" else bg.aopen_short
+    return closed, await open_one(symbol, qty, otype)
+
 # ========= re-entry =========
 async def schedule_reentry(symbol: str, direction: str, closed_size: float):
     """
@@ -145,9 +252,9 @@ async def schedule_reentry(symbol: str, direction: str, closed_size: float):
         async with symbol_lock(symbol):
             try:
                 if direction == "LONG":
-                    res = bg.open_long(symbol, _fmt_qty(qty), "market")
+                    res = await bg.aopen_long(symbol, bg.fmt_size(symbol, qty), "market")
                 else:
-                    res = bg.open_short(symbol, _fmt_qty(qty), "market")
+                    res = await bg.aopen_short(symbol, bg.fmt_size(symbol, qty), "market")
                 _watch_symbols.add(symbol)
                 _last_reentry_at[symbol] = time.time()
                 _reentry_tries_since_tp[symbol] = _reentry_tries_since_tp.get(symbol, 0) + 1
@@ -171,7 +278,7 @@ async def tp_monitor_loop():
         try:
             for sym in list(_watch_symbols):
                 try:
-                    d = bg.get_hedge_detail(sym)
+                    d = await bg.aget_hedge_detail(sym)
                     # LONG
                     ls = float(d["long"]["size"] or 0)
                     lm = float(d["long"]["margin"] or 0)
@@ -180,7 +287,7 @@ async def tp_monitor_loop():
                         roe = lp / lm
                         if roe >= TP_ROE_PERCENT:
                             logger.info("[tp] LONG ROE %.4f >= %.4f | %s", roe, TP_ROE_PERCENT, sym)
-                            bg.close_long(sym, _fmt_qty(ls))
+                            await bg.aclose_long(sym, bg.fmt_size(sym, ls))
                             # 동일 방향 재진입
                             await schedule_reentry(sym, "LONG", ls)
 
@@ -192,7 +299,7 @@ async def tp_monitor_loop():
                         roe = sp / sm
                         if roe >= TP_ROE_PERCENT:
                             logger.info("[tp] SHORT ROE %.4f >= %.4f | %s", roe, TP_ROE_PERCENT, sym)
-                            bg.close_short(sym, _fmt_qty(ss))
+                            await bg.aclose_short(sym, bg.fmt_size(sym, ss))
                             # 동일 방향 재진입
                             await schedule_reentry(sym, "SHORT", ss)
 
@@ -204,10 +311,44 @@ async def tp_monitor_loop():
             logger.info("[tp] loop err: %r", e)
             await asyncio.sleep(TP_CHECK_SEC)
 
+# ========= clock sync =========
+async def time_sync_loop():
+    """
+    서버 시간 오프셋을 주기적으로 갱신 (주문 경로에서 40008 재동기화 방지)
+    """
+    while True:
+        try:
+            off = await bg.async_time()
+            logger.debug("[time] offset=%dms", off)
+        except Exception as e:
+            logger.info("[time] sync err: %r", e)
+        await asyncio.sleep(TIME_SYNC_SEC)
+
 @app.on_event("startup")
 async def _startup():
+    # one multiplexed HTTP/2 connection to Bitget shared by every route / loop
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    )
+    bg.aclient = app.state.http
+    try:
+        n = await bg.aload_contracts()
+        logger.info("[contracts] loaded %d symbol specs", n)
+    except Exception as e:
+        logger.info("[contracts] load err: %r", e)
+    asyncio.create_task(time_sync_loop())
     asyncio.create_task(tp_monitor_loop())
 
+@app.on_event("shutdown")
+async def _shutdown():
+    bg.aclient = None
+    await app.state.http.aclose()
+
 # ========= routes =========
 @app.get("/")
 def root():
@@ -227,16 +368,14 @@ def root():
 
 @app.post("/tv")
 async def tv(request: Request):
+    raw = await request.body()
     try:
-        payload = await request.json()
-    except Exception:
-        raw = await request.body()
-        try:
-            payload = json.loads(raw.decode("utf-8"))
-        except Exception:
-            return JSONResponse({"ok": False, "error": "bad-json"}, 400)
+        payload = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return JSONResponse({"ok": False, "error": "bad-json"}, 400)
 
-    if str(payload.get("secret")) != str(WEBHOOK_SECRET):
+    secret = payload.get("secret") if isinstance(payload, dict) else None
+    if not secret or not hmac.compare_digest(str(secret).encode("utf-8"), _WEBHOOK_SECRET_B):
         return JSONResponse({"ok": False, "error": "unauthorized"}, 401)
 
     route = str(payload.get("route", "")).strip()
@@ -249,13 +388,19 @@ async def tv(request: Request):
     logger.info("[TV] route=%s symbol=%s target=%s size=%s", route, symbol, target, size)
 
     async with symbol_lock(symbol):
-        if route == "order.open":
+        if route in ("order.open", "order.reverse"):
             if size <= 0:
                 return JSONResponse({"ok": False, "error": "invalid-size"}, 400)
+            try:
+                qty = bg.fmt_size(symbol, size)  # truncated to lot step
+            except ValueError:
+                return JSONResponse({"ok": False, "error": "size-below-lot"}, 400)
+
+        if route == "order.open":
             if target == "BUY":
-                res = bg.open_long(symbol, _fmt_qty(size), otype)
+                res = await bg.aopen_long(symbol, qty, otype)
             elif target == "SELL":
-                res = bg.open_short(symbol, _fmt_qty(size), otype)
+                res = await bg.aopen_short(symbol, qty, otype)
             else:
                 return JSONResponse({"ok": False, "error": "bad-target-side"}, 400)
             _watch_symbols.add(symbol)
@@ -264,21 +409,17 @@ async def tv(request: Request):
             return {"ok": True, "opened": res}
 
         elif route == "order.reverse":
-            if size <= 0:
-                return JSONResponse({"ok": False, "error": "invalid-size"}, 400)
             if target == "BUY":
-                closed = await ensure_close_full(symbol, "SHORT")
-                if not closed.get("ok"):
-                    return JSONResponse({"ok": False, "error": "close-failed", "detail": closed}, 500)
-                res = bg.open_long(symbol, _fmt_qty(size), otype)
+                closed, res = await reverse_batch(symbol, "SHORT", qty, otype)
             elif target == "SELL":
-                closed = await ensure_close_full(symbol, "LONG")
-                if not closed.get("ok"):
-                    return JSONResponse({"ok": False, "error": "close-failed", "detail": closed}, 500)
-                res = bg.open_short(symbol, _fmt_qty(size), otype)
+                closed, res = await reverse_batch(symbol, "LONG", qty, otype)
             else:
                 return JSONResponse({"ok": False, "error": "bad-target-side"}, 400)
-            _watch_symbols.add(symbol)
+            if res is not None and not (isinstance(res, dict) and res.get("ok") is False):
+                # 청산 확인 실패여도 배치가 이미 신규 진입했을 수 있음 -> TP 감시는 유지
+                _watch_symbols.add(symbol)
+            if not closed.get("ok"):
+                return JSONResponse({"ok": False, "error": "close-failed", "detail": closed, "opened": res}, 500)
             _reentry_tries_since_tp[symbol] = 0
             return {"ok": True, "closed": closed, "opened": res}
 